@@ -1,6 +1,10 @@
 import os
 import io
-import base64
+import re
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from email.message import EmailMessage
 
@@ -8,20 +12,27 @@ from email.message import EmailMessage
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-from google.auth.transport.requests import Request
+from google.auth.transport.requests import AuthorizedSession, Request
+import google.auth.exceptions
+import google_auth_httplib2
+import httplib2
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # PDF
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
 from reportlab.lib.utils import ImageReader
+from pypdf import PdfReader, PdfWriter
 
 # ------------ CONFIG (edit these) ------------
 # Google Sheet config
 SPREADSHEET_ID = "1aGXDjQNcQhwasma-SKBb2ih8GDjpDutdV1k1ZvGKC88"
 SHEET_TAB_NAME = "Sheet1"          # e.g. the sheet/tab name
 DATA_RANGE = "A2:J"                  # rows start at A1 to allow headers in row 1
+HEADER_RANGE = "A1:J1"               # header row, read in the same request as the data
 
 # Expected columns (A..J). Adjust if your sheet differs.
 # A: Date
@@ -63,6 +74,31 @@ Best regards,
 {business}
 """
 
+# Socket timeout (seconds) for every Google API HTTP connection
+HTTP_TIMEOUT = 30
+
+# Worker threads for concurrent Gmail sends
+MAX_WORKERS = 8
+
+# Rendered invoices waiting to be sent; bounds memory when rendering outpaces sending
+PDF_QUEUE_SIZE = 16
+
+# How often (seconds) blocked queue waits re-check whether the run was stopped
+QUEUE_POLL_SECONDS = 0.2
+
+# Invoices drawn as pages of one canvas before being split into per-invoice PDFs
+RENDER_CHUNK_SIZE = 16
+
+# Gmail allows 250 quota units/user/second and messages.send costs 100 units
+GMAIL_SENDS_PER_SECOND = 2
+
+# Retries (with exponential backoff) for API calls that hit 429/503 or fail to connect
+API_NUM_RETRIES = 5
+
+# REST endpoints for the per-invoice hot path, called directly on the AuthorizedSession
+GMAIL_SEND_URL = "https://gmail.googleapis.com/upload/gmail/v1/users/me/messages/send"
+SHEETS_BATCH_UPDATE_URL = f"https://sheets.googleapis.com/v4/spreadsheets/{SPREADSHEET_ID}/values:batchUpdate"
+
 # Scopes: Gmail send + Sheets read/write
 SCOPES = [
     "https://www.googleapis.com/auth/gmail.send",
@@ -70,13 +106,28 @@ SCOPES = [
 ]
 # ---------------------------------------------
 
-def get_google_services():
+# Logo decoded once at import and reused for every invoice
+_LOGO = None
+if LOGO_PATH and os.path.exists(LOGO_PATH):
+    try:
+        _LOGO = ImageReader(LOGO_PATH)
+    except Exception:
+        pass
+
+# Built once per process and reused by every call below
+_creds = None
+_services = None
+
+
+def get_credentials():
     """
-    Auth + return Sheets and Gmail services. Requires credentials.json in the working folder.
+    Auth + return OAuth credentials. Requires credentials.json in the working folder.
     On first run, a browser window will ask you to sign in; token.json is then cached.
+    The credentials are cached for the rest of the process.
     """
-    creds = None
-    if os.path.exists("token.json"):
+    global _creds
+    creds = _creds
+    if creds is None and os.path.exists("token.json"):
         creds = Credentials.from_authorized_user_file("token.json", SCOPES)
 
     if not creds or not creds.valid:
@@ -88,23 +139,64 @@ def get_google_services():
         with open("token.json", "w") as token:
             token.write(creds.to_json())
 
-    sheets_service = build("sheets", "v4", credentials=creds)
-    gmail_service = build("gmail", "v1", credentials=creds)
-    return sheets_service, gmail_service
+    _creds = creds
+    return creds
 
 
-def fetch_invoice_rows(sheets_service):
+def _authorized_http(creds):
     """
-    Returns (values, start_row_index) where values is a list of rows within DATA_RANGE.
-    We compute the absolute row number to write status back correctly.
+    Returns a new httplib2.Http that signs requests with creds.
     """
-    range_name = f"{SHEET_TAB_NAME}!{DATA_RANGE}"
-    resp = sheets_service.spreadsheets().values().get(
-        spreadsheetId=SPREADSHEET_ID,
-        range=range_name
-    ).execute()
+    return google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+
+
+def _authorized_session(creds):
+    """
+    Returns a requests.Session that signs requests with creds. Its connection pool is
+    sized for MAX_WORKERS and retries 429/503 responses and failed connections with
+    exponential backoff. Read errors and timeouts are never retried: the server may
+    already have accepted a messages.send, and retrying would deliver a duplicate email.
+    """
+    retry = Retry(
+        total=API_NUM_RETRIES,
+        connect=API_NUM_RETRIES,
+        read=0,
+        other=0,
+        backoff_factor=1,
+        status_forcelist=(429, 503),
+        allowed_methods=None,
+    )
+    session = AuthorizedSession(creds)
+    session.mount("https://", HTTPAdapter(pool_maxsize=MAX_WORKERS, max_retries=retry))
+    return session
+
+
+def get_google_services(creds):
+    """
+    Return the Sheets service (used for the row read) and an AuthorizedSession
+    for the hot-path REST calls: Gmail sends and the status write-back.
+    Both are built once and cached for the rest of the process.
+    static_discovery=True uses the discovery document bundled with
+    google-api-python-client, so building the Sheets service makes no network calls.
+    The session's connection pool is thread-safe, so every send worker shares it
+    (and its kept-alive TLS connections) instead of owning a separate Http.
+    """
+    global _services
+    if _services is None:
+        sheets_service = build("sheets", "v4", http=_authorized_http(creds), static_discovery=True)
+        session = _authorized_session(creds)
+        _services = (sheets_service, session)
+    return _services
 
-    values = resp.get("values", [])
+
+def fetch_invoice_rows(sheets_service):
+    """
+    Returns a list of (row_number, row) for every row within DATA_RANGE not yet marked SENT,
+    dropping rows whose Ticket ID is marked SENT on any other row of the sheet.
+    row_number is the absolute sheet row, used to write status back correctly.
+    The header row (row 1) is read in the same batchGetByDataFilter request, and the
+    response is trimmed to the cell values with a `fields` partial-response mask.
+    """
     # Figure out start row (A2 -> row index 2)
     # Parse the number after 'A' in DATA_RANGE start (assumes like "A2:I")
     start_row = 2
@@ -114,28 +206,83 @@ def fetch_invoice_rows(sheets_service):
     except Exception:
         pass
 
-    return values, start_row
+    body = {
+        "dataFilters": [
+            {"a1Range": f"{SHEET_TAB_NAME}!{DATA_RANGE}"},
+            {"a1Range": f"{SHEET_TAB_NAME}!{HEADER_RANGE}"},
+        ],
+        "majorDimension": "ROWS",
+    }
+    resp = sheets_service.spreadsheets().values().batchGetByDataFilter(
+        spreadsheetId=SPREADSHEET_ID,
+        body=body,
+        fields="valueRanges/valueRange/values"
+    ).execute(num_retries=API_NUM_RETRIES)
+
+    data_range, header = [m.get("valueRange", {}) for m in resp.get("valueRanges", [{}, {}])]
+    values = data_range.get("values", [])
+
+    # Warn if the sheet's columns no longer line up with COL_* (e.g. a column was inserted)
+    header_row = (header.get("values") or [[]])[0]
+    if len(header_row) > COL_Status and header_row[COL_Status].strip().lower() != "status":
+        print(f"Warning: expected 'Status' header in column J, found '{header_row[COL_Status]}'.")
+
+    # Ticket IDs already invoiced anywhere in the sheet (re-runs, copy-pastes),
+    # collected first so a copy above its SENT row is caught too
+    sent_ids = {
+        _cell(row, COL_Ticket_ID) for row in values
+        if _cell(row, COL_Status).upper().startswith("SENT")
+    }
+    sent_ids.discard("")
+
+    # Drop rows already marked SENT, and unsent copies of a ticket that was already SENT on another row
+    unsent = []
+    already_sent = 0
+    for idx, row in enumerate(values, start=start_row):
+        ticket_id = _cell(row, COL_Ticket_ID)
+        if _cell(row, COL_Status).upper().startswith("SENT"):
+            already_sent += 1
+        elif ticket_id in sent_ids:
+            print(f"Row {idx}: Ticket ID {ticket_id} already SENT on another row, skipping.")
+        else:
+            unsent.append((idx, row))
+    if already_sent:
+        print(f"Skipping {already_sent} row(s) already SENT.")
+
+    return unsent
 
 
-def generate_invoice_pdf_bytes(invoice):
+# Page layout in points, computed once instead of on every invoice
+_PAGE_W, _PAGE_H = A4
+_MARGIN = 18 * mm
+_LEFT_X = _MARGIN
+_RIGHT_X = _PAGE_W - _MARGIN
+_TOP_Y = _PAGE_H - _MARGIN
+
+# Per-invoice field positions (drawn by _draw_invoice)
+_INVOICE_NO_Y = _TOP_Y - 32 * mm
+_INVOICE_DATE_Y = _TOP_Y - 37 * mm
+_DUE_DATE_Y = _TOP_Y - 42 * mm
+_CLIENT_Y = _TOP_Y - 56 * mm
+_CLIENT_EMAIL_Y = _TOP_Y - 61 * mm
+_ITEM_Y = _TOP_Y - 80 * mm
+_TOTAL_Y = _ITEM_Y - 10 * mm
+
+
+def _build_template():
     """
-    Creates a simple PDF invoice in memory and returns bytes.
-    invoice: dict with keys client, email, invoice_no, invoice_date, due_date, desc, amount, currency
+    Draws everything that is the same on every invoice (logo, business block,
+    title, labels, footer) and returns it as PDF bytes.
     """
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
-
-    # Margins
-    margin = 18 * mm
-    x = margin
-    y = height - margin
+    x = _LEFT_X
+    y = _TOP_Y
 
     # Logo (optional)
-    if LOGO_PATH and os.path.exists(LOGO_PATH):
+    if _LOGO is not None:
         try:
-            img = ImageReader(LOGO_PATH)
-            c.drawImage(img, x, y - 20*mm, width=30*mm, height=20*mm, preserveAspectRatio=True, mask='auto')
+            c.drawImage(_LOGO, x, y - 20*mm, width=30*mm, height=20*mm, preserveAspectRatio=True, mask='auto')
         except Exception:
             pass
 
@@ -146,48 +293,97 @@ def generate_invoice_pdf_bytes(invoice):
     c.drawString(x, y - 30*mm, BUSINESS_ADDRESS)
     c.drawString(x, y - 35*mm, f"Email: {BUSINESS_EMAIL} | Phone: {BUSINESS_PHONE}")
 
-    # Title + meta
+    # Title
     c.setFont("Helvetica-Bold", 16)
-    c.drawRightString(width - margin, y - 25*mm, "INVOICE")
-    c.setFont("Helvetica", 10)
-    c.drawRightString(width - margin, y - 32*mm, f"Invoice No: {invoice['invoice_no']}")
-    c.drawRightString(width - margin, y - 37*mm, f"Invoice Date: {invoice['invoice_date']}")
-    c.drawRightString(width - margin, y - 42*mm, f"Due Date: {invoice['due_date']}")
+    c.drawRightString(_RIGHT_X, y - 25*mm, "INVOICE")
 
     # Bill to
     c.setFont("Helvetica-Bold", 12)
     c.drawString(x, y - 50*mm, "Bill To")
-    c.setFont("Helvetica", 10)
-    c.drawString(x, y - 56*mm, invoice["client"])
-    c.drawString(x, y - 61*mm, invoice["email"])
 
     # Description + amount box
     c.setFont("Helvetica-Bold", 11)
     c.drawString(x, y - 72*mm, "Description")
-    c.drawString(width - margin - 40*mm, y - 72*mm, "Amount")
+    c.drawString(_RIGHT_X - 40*mm, y - 72*mm, "Amount")
+
+    # Footer
+    c.setFont("Helvetica-Oblique", 9)
+    c.drawString(x, _MARGIN, "Thank you for your business!")
+    c.showPage()
+    c.save()
+
+    pdf_bytes = buffer.getvalue()
+    buffer.close()
+    return pdf_bytes
 
+
+# Static invoice layout, rendered once; each invoice only stamps its own fields on top
+_TEMPLATE_BYTES = _build_template()
+
+
+def _draw_invoice(c, invoice):
+    """
+    Draws the per-invoice fields of one invoice as the next page of canvas c.
+    invoice: dict with keys client, email, invoice_no, invoice_date, due_date, desc, amount (float), currency
+    """
+    # Invoice meta
     c.setFont("Helvetica", 10)
-    text_y = y - 80*mm
+    c.drawRightString(_RIGHT_X, _INVOICE_NO_Y, f"Invoice No: {invoice['invoice_no']}")
+    c.drawRightString(_RIGHT_X, _INVOICE_DATE_Y, f"Invoice Date: {invoice['invoice_date']}")
+    c.drawRightString(_RIGHT_X, _DUE_DATE_Y, f"Due Date: {invoice['due_date']}")
+
+    # Bill to
+    c.drawString(_LEFT_X, _CLIENT_Y, invoice["client"])
+    c.drawString(_LEFT_X, _CLIENT_EMAIL_Y, invoice["email"])
+
+    # Description + amount
     desc = invoice["desc"] or "Services rendered"
-    c.drawString(x, text_y, desc)
-    c.drawRightString(width - margin, text_y, f"{invoice['currency']} {float(invoice['amount']):.2f}")
+    c.drawString(_LEFT_X, _ITEM_Y, desc)
+    amount_text = f"{invoice['currency']} {invoice['amount']:.2f}"
+    c.drawRightString(_RIGHT_X, _ITEM_Y, amount_text)
 
     # Total
     c.setFont("Helvetica-Bold", 12)
-    c.drawRightString(width - margin, text_y - 10*mm, f"Total: {invoice['currency']} {float(invoice['amount']):.2f}")
-
-    # Footer
-    c.setFont("Helvetica-Oblique", 9)
-    c.drawString(x, margin, "Thank you for your business!")
+    c.drawRightString(_RIGHT_X, _TOTAL_Y, f"Total: {amount_text}")
     c.showPage()
+
+
+def generate_invoice_pdfs(invoices):
+    """
+    Creates one PDF per invoice in memory and returns a list of bytes, in the same order.
+    All invoices are drawn as pages of a single canvas (one canvas setup and save for
+    the whole list), then each page is merged onto the _TEMPLATE_BYTES layout and
+    written out as its own PDF.
+    """
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    for invoice in invoices:
+        _draw_invoice(c, invoice)
     c.save()
 
-    pdf_bytes = buffer.getvalue()
+    # pypdf reads the overlays straight from the canvas buffer, no intermediate bytes copy.
+    # The template page is merged *under* each overlay page, so it is never modified
+    # and can be parsed once for the whole list.
+    buffer.seek(0)
+    template_page = PdfReader(io.BytesIO(_TEMPLATE_BYTES)).pages[0]
+    pdfs = []
+    for page in PdfReader(buffer).pages:
+        page.merge_page(template_page, over=False)
+        writer = PdfWriter()
+        writer.add_page(page)
+
+        # The overlay reader may still resolve objects from buffer while writing, so write elsewhere
+        out = io.BytesIO()
+        writer.write(out)
+        pdfs.append(out.getvalue())
     buffer.close()
-    return pdf_bytes
+    return pdfs
 
 
-def send_email_with_attachment(gmail_service, to_email, subject, body, filename, file_bytes):
+def build_email_with_attachment(to_email, subject, body, filename, file_bytes):
+    """
+    Builds the MIME bytes for one invoice email, ready to upload as message/rfc822.
+    """
     message = EmailMessage()
     message.set_content(body)
     message["To"] = to_email
@@ -197,100 +393,304 @@ def send_email_with_attachment(gmail_service, to_email, subject, body, filename,
     subtype = "pdf"
     message.add_attachment(file_bytes, maintype=maintype, subtype=subtype, filename=filename)
 
-    encoded_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
-    send_message = {"raw": encoded_message}
-    gmail_service.users().messages().send(userId="me", body=send_message).execute()
+    return message.as_bytes()
 
 
-def write_status_back(sheets_service, row_number, status_text):
+class RateLimiter:
     """
-    Writes status to column I for the given absolute row number (1-indexed in Sheets).
+    Thread-safe pacing limiter: allows `rate` tokens per `per` seconds.
+    acquire(n) sleeps just long enough that callers, together, never exceed the rate.
     """
-    cell_range = f"{SHEET_TAB_NAME}!J{row_number}"
-    body = {"values": [[status_text]]}
-    sheets_service.spreadsheets().values().update(
-        spreadsheetId=SPREADSHEET_ID,
-        range=cell_range,
-        valueInputOption="USER_ENTERED",
-        body=body
-    ).execute()
 
+    def __init__(self, rate, per=1.0):
+        self.interval = per / rate
+        self._next_free = time.monotonic()
+        self._lock = threading.Lock()
 
-def process_invoices():
-    sheets_service, gmail_service = get_google_services()
+    def acquire(self, tokens=1, cancel=None):
+        """
+        Waits for the caller's slot. If `cancel` (a threading.Event) is set while
+        waiting, returns False straight away; otherwise returns True.
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_free)
+            self._next_free = start + tokens * self.interval
+        if start > now:
+            if cancel is not None:
+                return not cancel.wait(start - now)
+            time.sleep(start - now)
+        return True
+
+
+_gmail_limiter = RateLimiter(GMAIL_SENDS_PER_SECOND)
 
-    rows, start_row = fetch_invoice_rows(sheets_service)
-    if not rows:
-        print("No data rows found.")
-        return
 
-    processed = 0
-    for idx, row in enumerate(rows, start=start_row):
-        # Safe extraction with defaults
-        def get(col, default=""):
-            return row[col].strip() if col < len(row) and row[col] else default
-
-        client = get(COL_Full_Name)
-        email = get(COL_Email_Address)
-        invoice_no = get(COL_Ticket_ID)
-        inv_date = get(COL_Date)
-        due_date = ""  # No due date column in your sheet
-        desc = f"Tickets: {get(COL_Number_of_Tickets)}, Table: {get(COL_Table_Number)}"
-        amount_raw = get(COL_Ticket_Price, "0")
-        # Extract numeric part from amount (e.g., "5000LKR" -> "5000")
-        amount = ''.join(filter(str.isdigit, amount_raw))
-        currency = "LKR"  # Hardcoded since your price column includes "LKR"
-        status = get(COL_Status)
-
-        # Skip incomplete or already SENT
-        if not client or not email or not amount or not invoice_no:
-            print(f"Row {idx}: missing required fields, skipping.")
+def _describe_error(e):
+    """
+    Returns e as text, with Google's error message from the response body appended
+    when there is one (raise_for_status() only reports the status line and URL).
+    """
+    response = getattr(e, "response", None)
+    if response is None:
+        return str(e)
+    try:
+        detail = response.json()["error"]["message"]
+    except Exception:
+        detail = response.text
+    return f"{e}: {detail}" if detail else str(e)
+
+
+def _send_one(session, idx, mime_bytes, stop):
+    """
+    Uploads one message to messages.send as raw message/rfc822 media.
+    Returns the status stamp, or None if Gmail rejected it or the run was stopped.
+    """
+    try:
+        # Stay under the per-user send quota instead of collecting 429s
+        if not _gmail_limiter.acquire(cancel=stop) or stop.is_set():
+            return None
+        resp = session.post(
+            GMAIL_SEND_URL,
+            params={"uploadType": "media", "fields": "id"},
+            data=mime_bytes,
+            headers={"Content-Type": "message/rfc822"},
+            timeout=HTTP_TIMEOUT,
+        )
+        resp.raise_for_status()
+    except (requests.RequestException, google.auth.exceptions.GoogleAuthError) as e:
+        # GoogleAuthError covers a failed token refresh inside AuthorizedSession
+        print(f"Row {idx}: Gmail API error → {_describe_error(e)}")
+        return None
+    except Exception as e:
+        print(f"Row {idx}: Failed → {e}")
+        return None
+    return datetime.now().strftime("SENT %Y-%m-%d %H:%M:%S")
+
+
+def _send_queued(session, pdf_q, sent, stop):
+    """
+    Consumer: sends queued (row_number, to_email, mime_bytes) items until it takes
+    the end marker (None) or `stop` is set. Records row_number -> status stamp in
+    `sent` right after each send, so a stamp is never lost even if a later item fails.
+    """
+    while not stop.is_set():
+        try:
+            item = pdf_q.get(timeout=QUEUE_POLL_SECONDS)
+        except queue.Empty:
             continue
-        if status.upper().startswith("SENT"):
-            print(f"Row {idx}: already SENT, skipping.")
+        if item is None:
+            return
+        idx, email, mime_bytes = item
+        stamp = _send_one(session, idx, mime_bytes, stop)
+        if stamp is not None:
+            sent[idx] = stamp
+            print(f"Row {idx}: sent to {email} ✔")
+
+
+def write_statuses_back(session, statuses):
+    """
+    Writes status to column J for every row in one values.batchUpdate call,
+    POSTed straight to the REST endpoint on the shared session.
+    statuses: dict mapping absolute row number (1-indexed in Sheets) -> status text.
+    """
+    data = [
+        {"range": f"{SHEET_TAB_NAME}!J{row_number}", "values": [[status_text]]}
+        for row_number, status_text in sorted(statuses.items())
+    ]
+    if not data:
+        return
+    body = {"valueInputOption": "USER_ENTERED", "data": data}
+    resp = session.post(
+        SHEETS_BATCH_UPDATE_URL,
+        params={"fields": "totalUpdatedCells"},
+        json=body,
+        timeout=HTTP_TIMEOUT,
+    )
+    resp.raise_for_status()
+
+
+# First number in a price cell, e.g. "5,000.50LKR" -> "5,000.50" (thousands separators allowed)
+_AMOUNT_RE = re.compile(r"\d[\d,]*(?:\.\d+)?")
+
+
+def _cell(row, col, default=""):
+    """
+    Safe extraction with defaults: stripped cell value, or default if the cell is missing/empty.
+    """
+    return row[col].strip() if col < len(row) and row[col] else default
+
+
+def invoice_from_row(idx, row):
+    """
+    Builds the invoice dict for one sheet row.
+    Returns None (and reports it) if required fields are missing.
+    """
+    client = _cell(row, COL_Full_Name)
+    email = _cell(row, COL_Email_Address)
+    invoice_no = _cell(row, COL_Ticket_ID)
+    inv_date = _cell(row, COL_Date)
+    due_date = ""  # No due date column in your sheet
+    desc = f"Tickets: {_cell(row, COL_Number_of_Tickets)}, Table: {_cell(row, COL_Table_Number)}"
+    amount_raw = _cell(row, COL_Ticket_Price, "0")
+    # Parse amount once (e.g., "5000LKR" -> 5000.0, "5000.50LKR" -> 5000.5)
+    m = _AMOUNT_RE.search(amount_raw)
+    amount = float(m.group(0).replace(",", "")) if m else None
+    currency = "LKR"  # Hardcoded since your price column includes "LKR"
+
+    # Skip incomplete (rows already SENT were dropped by fetch_invoice_rows)
+    if not client or not email or amount is None or not invoice_no:
+        print(f"Row {idx}: missing required fields, skipping.")
+        return None
+
+    return {
+        "client": client,
+        "email": email,
+        "invoice_no": invoice_no,
+        "invoice_date": inv_date or datetime.today().strftime("%Y-%m-%d"),
+        "due_date": due_date or "",
+        "desc": desc,
+        "amount": amount,
+        "currency": currency
+    }
+
+
+def build_invoice_email(invoice, pdf_bytes):
+    """
+    Builds the MIME bytes of the email for one invoice, with its PDF attached.
+    """
+    pdf_name = f"Invoice_{invoice['invoice_no']}.pdf"
+    subject = EMAIL_SUBJECT_TEMPLATE.format(invoice_no=invoice["invoice_no"], business=BUSINESS_NAME)
+    body = EMAIL_BODY_TEMPLATE.format(
+        client=invoice["client"],
+        invoice_no=invoice["invoice_no"],
+        invoice_date=invoice["invoice_date"],
+        currency=invoice["currency"],
+        amount=invoice["amount"],
+        due_date=invoice["due_date"] or "N/A",
+        business=BUSINESS_NAME,
+    )
+    return build_email_with_attachment(invoice["email"], subject, body, pdf_name, pdf_bytes)
+
+
+def _put_unless_stopped(pdf_q, item, stop):
+    """
+    Queues item, giving up if `stop` is set while the queue is full.
+    Returns True if the item was queued.
+    """
+    while not stop.is_set():
+        try:
+            pdf_q.put(item, timeout=QUEUE_POLL_SECONDS)
+            return True
+        except queue.Full:
             continue
+    return False
+
+
+def _render_invoices(unsent, pdf_q, consumers, stop):
+    """
+    Producer: renders unsent rows RENDER_CHUNK_SIZE at a time and queues each
+    (row_number, to_email, mime_bytes) for sending, then queues one end marker per consumer.
+    Only the first complete row for each Ticket ID is invoiced; later copies are skipped.
+    Stops early once `stop` is set.
+    """
+    seen = set()
+    try:
+        for start in range(0, len(unsent), RENDER_CHUNK_SIZE):
+            if stop.is_set():
+                return
+            invoices = []
+            for idx, row in unsent[start:start + RENDER_CHUNK_SIZE]:
+                invoice = invoice_from_row(idx, row)
+                if invoice is None:
+                    continue
+                # Marked seen only once the row is complete, so an incomplete
+                # first copy does not block a later complete one
+                if invoice["invoice_no"] in seen:
+                    print(f"Row {idx}: duplicate Ticket ID {invoice['invoice_no']}, skipping.")
+                    continue
+                seen.add(invoice["invoice_no"])
+                invoices.append((idx, invoice))
+            if not invoices:
+                continue
+
+            # 1) PDFs for the whole chunk; if that fails, render each invoice on its
+            # own so only the bad row fails
+            try:
+                pdfs = generate_invoice_pdfs([invoice for _idx, invoice in invoices])
+            except Exception:
+                pdfs = []
+                for idx, invoice in invoices:
+                    try:
+                        pdfs.extend(generate_invoice_pdfs([invoice]))
+                    except Exception as e:
+                        print(f"Row {idx}: Failed → {e}")
+                        pdfs.append(None)
+
+            # 2) Emails (sent by the _send_queued consumers)
+            for (idx, invoice), pdf_bytes in zip(invoices, pdfs):
+                if pdf_bytes is None:
+                    continue
+                try:
+                    mime_bytes = build_invoice_email(invoice, pdf_bytes)
+                except Exception as e:
+                    print(f"Row {idx}: Failed → {e}")
+                    continue
+                if not _put_unless_stopped(pdf_q, (idx, invoice["email"], mime_bytes), stop):
+                    return
+    finally:
+        for _ in range(consumers):
+            if not _put_unless_stopped(pdf_q, None, stop):
+                break
+
 
-        invoice = {
-    "client": client,
-    "email": email,
-    "invoice_no": invoice_no,
-    "invoice_date": inv_date or datetime.today().strftime("%Y-%m-%d"),
-    "due_date": due_date or "",
-    "desc": desc,
-    "amount": float(amount) if amount and amount.replace('.', '', 1).isdigit() else 0.0,
-    "currency": currency
-}
+def process_invoices():
+    creds = get_credentials()
+    sheets_service, session = get_google_services(creds)
+
+    unsent = fetch_invoice_rows(sheets_service)
+    if not unsent:
+        print("No unsent data rows found.")
+        return
+
+    # 1) PDFs are rendered on a producer thread while 2) the pool sends them,
+    # so rendering overlaps with Gmail round trips
+    pdf_q = queue.Queue(maxsize=PDF_QUEUE_SIZE)
+    stop = threading.Event()
+    producer = threading.Thread(target=_render_invoices, args=(unsent, pdf_q, MAX_WORKERS, stop), daemon=True)
+    producer.start()
 
+    sent = {}
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            consumers = [executor.submit(_send_queued, session, pdf_q, sent, stop) for _ in range(MAX_WORKERS)]
+            try:
+                for consumer in consumers:
+                    consumer.result()
+            except BaseException:
+                # Ctrl+C or a failed consumer: stop rendering and sending now,
+                # instead of waiting for the workers to drain every remaining row
+                stop.set()
+                raise
+        producer.join()
+    finally:
+        # 3) Mark SENT with timestamp, even if something above failed,
+        # so emails that already went out are not sent again on the next run
+        written = False
         try:
-            # 1) PDF
-            pdf_bytes = generate_invoice_pdf_bytes(invoice)
-            pdf_name = f"Invoice_{invoice_no}.pdf"
-
-            # 2) Email
-            subject = EMAIL_SUBJECT_TEMPLATE.format(invoice_no=invoice_no, business=BUSINESS_NAME)
-            body = EMAIL_BODY_TEMPLATE.format(
-                client=client,
-                invoice_no=invoice_no,
-                invoice_date=invoice["invoice_date"],
-                currency=currency,
-                amount=float(amount),
-                due_date=invoice["due_date"] or "N/A",
-                business=BUSINESS_NAME,
-            )
-            send_email_with_attachment(gmail_service, email, subject, body, pdf_name, pdf_bytes)
-
-            # 3) Mark SENT with timestamp
-            stamp = datetime.now().strftime("SENT %Y-%m-%d %H:%M:%S")
-            write_status_back(sheets_service, idx, stamp)
-
-            processed += 1
-            print(f"Row {idx}: sent to {email} ✔")
-        except HttpError as e:
-            print(f"Row {idx}: Google API error → {e}")
+            write_statuses_back(session, sent)
+            written = True
+        except requests.RequestException as e:
+            print(f"Status write-back: Google API error → {_describe_error(e)}")
         except Exception as e:
-            print(f"Row {idx}: Failed → {e}")
-
-    print(f"Done. Processed: {processed} invoice(s).")
+            print(f"Status write-back: Failed → {e}")
+        if not written:
+            # These emails went out; stamp them by hand or the next run sends them again
+            print(f"Could not write status for {len(sent)} row(s); set column J manually:")
+            for idx, stamp in sorted(sent.items()):
+                print(f"  Row {idx} -> {stamp}")
+
+    print(f"Done. Processed: {len(sent)} invoice(s).")
 
 
 if __name__ == "__main__":